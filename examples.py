@@ -3,16 +3,32 @@
 Examples demonstrating various features of the Technobabble Generator
 """
 
+import contextlib
+import functools
+import io
+from concurrent.futures import ProcessPoolExecutor
+
 from technobabble_generator import TechnobabbleGenerator
 
 
+@functools.lru_cache(maxsize=1)
+def _base_generator() -> TechnobabbleGenerator:
+    """Parse the grammar YAML once and share it across all examples."""
+    return TechnobabbleGenerator()
+
+
+def make_generator(seed=None) -> TechnobabbleGenerator:
+    """Create a generator that reuses the shared parsed grammar."""
+    return _base_generator().clone(seed=seed)
+
+
 def example_basic():
     """Basic usage example."""
     print("=" * 80)
     print("EXAMPLE 1: Basic Generation")
     print("=" * 80)
     
-    gen = TechnobabbleGenerator()
+    gen = make_generator()
     output = gen.generate(num_sentences=5)
     print(output)
     print()
@@ -28,14 +44,14 @@ def example_reproducible():
     print(f"Using seed: {seed}\n")
     
     # First generation
-    gen1 = TechnobabbleGenerator(seed=seed)
+    gen1 = make_generator(seed=seed)
     output1 = gen1.generate(num_sentences=4)
     print("First generation:")
     print(output1)
     print()
     
     # Second generation with same seed
-    gen2 = TechnobabbleGenerator(seed=seed)
+    gen2 = make_generator(seed=seed)
     output2 = gen2.generate(num_sentences=4)
     print("Second generation (should be identical):")
     print(output2)
@@ -51,7 +67,7 @@ def example_no_mutations():
     print("EXAMPLE 3: Generation Without Mutations")
     print("=" * 80)
     
-    gen = TechnobabbleGenerator(seed=123)
+    gen = make_generator(seed=123)
     output = gen.generate(num_sentences=6, apply_mutations=False)
     print(output)
     print("\n(Note: No [URGENT], [CRITICAL], or capitalized terms)")
@@ -64,7 +80,7 @@ def example_context_memory():
     print("EXAMPLE 4: Context Memory")
     print("=" * 80)
     
-    gen = TechnobabbleGenerator(seed=456)
+    gen = make_generator(seed=456)
     
     for i in range(3):
         output = gen.generate(num_sentences=2)
@@ -81,7 +97,7 @@ def example_variable_length():
     print("EXAMPLE 5: Variable Length Generation")
     print("=" * 80)
     
-    gen = TechnobabbleGenerator(seed=789)
+    gen = make_generator(seed=789)
     
     for num in [4, 7, 10]:
         output = gen.generate(num_sentences=num)
@@ -96,7 +112,7 @@ def example_batch_generation():
     print("EXAMPLE 6: Batch Generation (Multiple Reports)")
     print("=" * 80)
     
-    gen = TechnobabbleGenerator()
+    gen = make_generator()
     
     for i in range(3):
         print(f"\n--- Report {i+1} ---")
@@ -106,19 +122,35 @@ def example_batch_generation():
     print()
 
 
+def _run_example(example) -> str:
+    """Run one example in a worker process, capturing its printed output."""
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        example()
+    return buffer.getvalue()
+
+
 def main():
     """Run all examples."""
     print("\n" + "=" * 80)
     print("TECHNOBABBLE GENERATOR - EXAMPLES")
     print("=" * 80 + "\n")
-    
-    example_basic()
-    example_reproducible()
-    example_no_mutations()
-    example_context_memory()
-    example_variable_length()
-    example_batch_generation()
-    
+
+    examples = [
+        example_basic,
+        example_reproducible,
+        example_no_mutations,
+        example_context_memory,
+        example_variable_length,
+        example_batch_generation,
+    ]
+
+    # The examples are independent and CPU-bound, so run them in parallel
+    # worker processes and print the captured output in the original order
+    with ProcessPoolExecutor(max_workers=len(examples)) as executor:
+        for output in executor.map(_run_example, examples):
+            print(output, end='')
+
     print("=" * 80)
     print("All examples completed!")
     print("=" * 80)
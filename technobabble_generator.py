@@ -4,11 +4,74 @@ Technobabble Generator - A rule-based hacker shitpost generator
 Generates plausible-sounding but meaningless security technobabble
 """
 
+import os
+import pickle
+import sys
+import tempfile
 import yaml
 import random
 import re
+from bisect import bisect
+from itertools import accumulate
 from typing import Dict, List, Tuple, Optional, Any
 
+try:
+    # C-accelerated loader (libyaml); much faster for the large grammar file
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+
+# Matches one innermost DSL expression: a brace group with no nested braces
+_DSL_RE = re.compile(r'\{([^{}]+)\}')
+
+# Fused token pattern: group 1 is an innermost DSL brace group, group 2 a
+# <symbol> non-terminal; one sub() pass handles both
+_TOKEN_RE = re.compile(r'\{([^{}]+)\}|<([^<>]+)>')
+
+# Security terms that get randomly capitalized, with their patterns
+# compiled once instead of per sentence
+_SECURITY_TERMS = ['critical', 'vulnerability', 'exploit', 'remote', 'authentication']
+
+# Symbols whose expansions are remembered in the context memory
+_CONTEXT_KEYS = frozenset(('vendor', 'os', 'product', 'version_number'))
+_MUTATION_PATTERNS = [
+    (re.compile(r'\b' + term + r'\b', re.IGNORECASE), term.upper())
+    for term in _SECURITY_TERMS
+]
+
+# One alternation to gate the per-term loop: most sentences have no term
+_ANY_SECURITY_RE = re.compile(r'\b(?:' + '|'.join(_SECURITY_TERMS) + r')\b', re.IGNORECASE)
+
+# Header/footer lines that are exempt from sentence mutations
+_FORMAT_HEADER_RE = re.compile(
+    r"^(?:🧵|📚|🚨|⚠️|🔴"
+    r"|Thread|THREAD|Story|Daily|What I|Today's|Another day|Flexing|POV:|Friendly)"
+)
+_POST_HEADER_RE = re.compile(r'^(?:🚨|⚠️|🔴|```)')
+
+# Sentinel distinguishing "not stored" from any stored value
+_MISSING = object()
+
+
+def _pick_k(seq, k: int, rand=random.random) -> List[str]:
+    """
+    Pick k distinct items from seq via a partial Fisher-Yates shuffle.
+
+    Cheaper than random.sample for the small picks the DSL makes: only the
+    first k swaps of the shuffle are performed and no pool copy is made.
+    """
+    n = len(seq)
+    if k > n:
+        k = n
+    idx = list(range(n))
+    out = []
+    for i in range(k):
+        j = i + int(rand() * (n - i))
+        idx[i], idx[j] = idx[j], idx[i]
+        out.append(seq[idx[i]])
+    return out
+
 
 class TechnobabbleGenerator:
     """
@@ -28,33 +91,318 @@ class TechnobabbleGenerator:
             seed: Random seed for reproducibility (optional)
         """
         self.grammar = self._load_grammar(grammar_file)
+        self.choices = self._compile_choices(self.grammar)
+        # Categories whose options are all plain strings: their expansions
+        # can never produce more work for the scanner
+        self.pure_terminals = {
+            category for category, (texts, _, _) in self.choices.items()
+            if not any('<' in t or '{' in t for t in texts)
+        }
+        # Categories with exactly one production are deterministic: their
+        # expansion never changes, so skip the weighted draw entirely
+        self._singletons = {
+            category: texts[0]
+            for category, (texts, _, _) in self.choices.items()
+            if len(texts) == 1
+        }
         self.context = {}  # Context memory for OS, Vendor, Version, etc.
         self.variables = {}  # Variable storage for consistency (e.g., {VAR:name})
         self.used_sentences = set()  # Track used sentences to avoid repetition
         self.seed = seed
         self.seed_multipliers = {}  # Store seed multipliers for sub-generators
-        if seed is not None:
-            random.seed(seed)
+        self._dsl_cache = {}  # Pre-split DSL option lists, keyed by expression
+        # Dedicated RNG: no global-state sharing between generator instances
+        self._rng = random.Random(seed)
+        self._bind_rng_shortcuts()
     
+    def _bind_rng_shortcuts(self):
+        """Bind the hot RNG methods once, skipping a LOAD_ATTR per draw."""
+        self._rand = self._rng.random
+        self._randint = self._rng.randint
+        self._choice = self._rng.choice
+
     def _load_grammar(self, grammar_file: str) -> Dict[str, List[Tuple[int, str]]]:
-        """Load grammar rules from YAML file."""
-        with open(grammar_file, 'r') as f:
-            return yaml.safe_load(f)
+        """
+        Load grammar rules from YAML file.
+
+        The parsed grammar is cached in a sibling .pkl file keyed on the
+        YAML's mtime and size, so repeat startups skip YAML parsing
+        entirely; editing the YAML invalidates the cache automatically.
+        """
+        cache_file = grammar_file + '.pkl'
+        stat = os.stat(grammar_file)
+        meta = (stat.st_mtime, stat.st_size)
+
+        try:
+            with open(cache_file, 'rb') as f:
+                cached_meta, raw = pickle.load(f)
+            if cached_meta != meta:
+                raw = None
+        except (OSError, pickle.PickleError, EOFError, ValueError):
+            raw = None
+
+        if raw is None:
+            with open(grammar_file, 'r') as f:
+                raw = yaml.load(f, Loader=_YamlLoader)
+            try:
+                # Write via a temp file so a crash never leaves a torn cache
+                fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(cache_file)))
+                with os.fdopen(fd, 'wb') as f:
+                    pickle.dump((meta, raw), f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, cache_file)
+            except OSError:
+                pass  # Caching is best-effort
+
+        # Interned keys hit CPython's pointer-compare fast path on every
+        # symbol lookup during expansion
+        return self._intern_texts(self._fold_singletons(
+            {sys.intern(key): rules for key, rules in raw.items()}
+        ))
+
+    @staticmethod
+    def _intern_texts(grammar):
+        """
+        Intern every RHS string so repeated expansions share one object.
+
+        Identical terminals then hash and compare by pointer in the context
+        dict, the dedup set and downstream string work, instead of carrying
+        duplicate copies per rule.
+        """
+        return {
+            key: [[weight, sys.intern(text)] for weight, text in options]
+            for key, options in grammar.items()
+        }
+
+    @staticmethod
+    def _fold_singletons(grammar):
+        """
+        Inline single-production rules into their parents (constant folding).
+
+        A category with exactly one production always expands the same way,
+        so references to it can be substituted into every parent RHS at load
+        time, shaving one expansion level per reference. The rules
+        themselves stay in the grammar so direct expansion and category
+        calls keep working. Context-memory symbols are left alone — their
+        expansion is observed via _expand_symbol — as are self-recursive
+        singletons.
+        """
+        changed = True
+        while changed:
+            changed = False
+            for symbol, options in grammar.items():
+                if len(options) != 1 or symbol in _CONTEXT_KEYS:
+                    continue
+                expansion = options[0][1]
+                token = '<' + symbol + '>'
+                if token in expansion:
+                    continue
+                for other, other_options in grammar.items():
+                    if other is symbol:
+                        continue
+                    for i, (weight, text) in enumerate(other_options):
+                        if token in text:
+                            other_options[i] = [weight, text.replace(token, expansion)]
+                            changed = True
+        return grammar
     
+    @staticmethod
+    def _compile_choices(grammar: Dict[str, List[Tuple[int, str]]]) -> Dict[str, Tuple[Tuple[str, ...], List[int], int]]:
+        """
+        Precompile each category into (texts, cumulative_weights, total).
+
+        Built once at load time so weighted picks are a single bisect on
+        ready-made arrays instead of rebuilding weight lists per call.
+        """
+        compiled = {}
+        for category, options in grammar.items():
+            texts = tuple(t for _, t in options)
+            cum = list(accumulate(w for w, _ in options))
+            compiled[category] = (texts, cum, cum[-1])
+        return compiled
+
+    def _pick(self, category: str) -> str:
+        """Weighted pick from a grammar category via its precompiled table."""
+        texts, cum, total = self.choices[category]
+        return texts[bisect(cum, self._rand() * total)]
+
     def _weighted_choice(self, options: List[Tuple[int, str]]) -> str:
         """
         Select an option based on weights.
-        
+
+        Used for ad-hoc option lists; grammar categories go through the
+        precompiled tables in _pick instead.
+
         Args:
             options: List of (weight, text) tuples
-            
+
         Returns:
             Selected text based on weighted random choice
         """
-        weights = [w for w, _ in options]
+        cum = list(accumulate(w for w, _ in options))
         texts = [t for _, t in options]
-        return random.choices(texts, weights=weights, k=1)[0]
+        return texts[bisect(cum, self._rand() * cum[-1])]
     
+    def _split_options(self, expr: str, body: Optional[str] = None) -> Tuple[str, ...]:
+        """
+        Split a DSL option list, caching the result per expression.
+
+        The expressions come from a fixed grammar, so each distinct option
+        list is split and stripped exactly once per process; later
+        resolutions are a dict hit returning the ready tuple.
+        """
+        cached = self._dsl_cache.get(expr)
+        if cached is None:
+            source = body if body is not None else expr[2:]
+            cached = tuple(opt.strip() for opt in source.strip().split('|'))
+            self._dsl_cache[expr] = cached
+        return cached
+
+    def _split_weighted_options(self, expr: str) -> Tuple[Tuple[str, ...], List[float]]:
+        """Split a {W item:weight|...} list into cached (items, cum_weights)."""
+        cached = self._dsl_cache.get(expr)
+        if cached is None:
+            items = []
+            weights = []
+            for option in expr[2:].strip().split('|'):
+                item, weight = option.strip().rsplit(':', 1)
+                items.append(item.strip())
+                weights.append(float(weight))
+            cached = (tuple(items), list(accumulate(weights)))
+            self._dsl_cache[expr] = cached
+        return cached
+
+    def _resolve_expression(self, expr: str) -> str:
+        """Resolve a single DSL expression to its replacement text."""
+        expr = expr.strip()
+        # O(1) dispatch on the command's first character instead of a chain
+        # of startswith checks; each handler re-validates its full prefix
+        handler = self._DSL_DISPATCH.get(expr[:1])
+        if handler is not None:
+            return handler(self, expr)
+        return '{' + expr + '}'  # Return original if not matched
+
+    def _dsl_var(self, expr: str) -> str:
+        """Variable storage/retrieval: {VAR:name value} or {VAR:name}."""
+        if not expr.startswith('VAR:'):
+            return '{' + expr + '}'
+        parts = expr[4:].strip().split(None, 1)
+        var_name = parts[0]
+        # One hash lookup covers both the existence check and the fetch
+        stored = self.variables.get(var_name, _MISSING)
+        if len(parts) > 1:
+            # Store value and resolve it: {VAR:cve CVE-2021-{R 1000-9999}};
+            # an already-stored variable is not re-resolved
+            if stored is not _MISSING:
+                return stored
+            value = parts[1]
+            # Resolve any nested expressions in the value
+            resolved_value = self._resolve_dsl(value)
+            self.variables[var_name] = resolved_value
+            return resolved_value
+        else:
+            # Retrieve value: {VAR:cve}
+            if stored is not _MISSING:
+                return stored
+            return '{' + expr + '}'
+
+    def _dsl_random(self, expr: str) -> str:
+        """Random range: {R 100-999} or {R 100-999 SEED:mult}."""
+        if not expr.startswith('R '):
+            return '{' + expr + '}'
+        range_part = expr[2:].strip()
+        try:
+            # Check if there's a seed multiplier
+            seed_mult = None
+            if 'SEED:' in range_part:
+                parts = range_part.split('SEED:')
+                range_part = parts[0].strip()
+                seed_mult = parts[1].strip()
+
+            start, end = map(int, range_part.split('-'))
+
+            # If seed multiplier is provided, use it to create a sub-generator
+            if seed_mult and self.seed is not None:
+                # Store or retrieve the value for this seed multiplier;
+                # the range is part of the key so the same multiplier can
+                # safely be used with different ranges
+                key = (seed_mult, start, end)
+                cached = self.seed_multipliers.get(key)
+                if cached is None:
+                    # Create a unique seed based on base seed and multiplier
+                    # Always use hash for consistency regardless of multiplier type
+                    mult_value = int(seed_mult) if seed_mult.isdigit() else seed_mult
+                    # A dedicated Random instance avoids the expensive
+                    # save/restore of the global RNG state
+                    sub_rng = random.Random(hash((self.seed, mult_value)))
+                    cached = str(sub_rng.randint(start, end))
+                    self.seed_multipliers[key] = cached
+                return cached
+            else:
+                return str(self._randint(start, end))
+        except (ValueError, IndexError):
+            return '{' + expr + '}'  # Return original if invalid
+
+    def _dsl_or(self, expr: str) -> str:
+        """OR choice: {O opt1|opt2|opt3}."""
+        if not expr.startswith('O '):
+            return '{' + expr + '}'
+        options = self._split_options(expr)
+        return self._choice(options)
+
+    def _dsl_multi(self, expr: str) -> str:
+        """Multi-pick: {M2 item1|item2|item3} or {MN item1|item2|item3}."""
+        parts = expr.split(' ', 1)
+        try:
+            count = int(parts[0][1:])  # Extract number from M2, M3, etc.
+            items = self._split_options(expr, parts[1])
+            # Pick 'count' unique items
+            selected = _pick_k(items, count, self._rand)
+            return ' '.join(selected)
+        except (ValueError, IndexError):
+            return '{' + expr + '}'
+
+    def _dsl_weighted(self, expr: str) -> str:
+        """Weighted choice: {W item1:weight1|item2:weight2}."""
+        if not expr.startswith('W '):
+            return '{' + expr + '}'
+        try:
+            items, cum = self._split_weighted_options(expr)
+            return items[bisect(cum, self._rand() * cum[-1])]
+        except (ValueError, IndexError):
+            return '{' + expr + '}'
+
+    def _dsl_category(self, expr: str) -> str:
+        """Category call: {C CATEGORY} or {C2 CATEGORY}."""
+        # Check if it's multi-pick from category like {C2 ACTION}
+        if len(expr) > 1 and expr[1].isdigit():
+            try:
+                count = int(expr[1])
+                category = expr[2:].strip()
+                if category in self.grammar:
+                    # Pick 'count' unique items from the precompiled
+                    # category texts (no per-call list rebuild)
+                    options = self.choices[category][0]
+                    selected = _pick_k(options, count, self._rand)
+                    return ' '.join(selected)
+            except (ValueError, IndexError):
+                return '{' + expr + '}'
+        else:
+            # Simple category call {C CATEGORY}
+            category = expr[1:].strip()
+            if category in self.grammar:
+                return self._pick(category)
+
+        return '{' + expr + '}'  # Return original if not matched
+
+    _DSL_DISPATCH = {
+        'V': _dsl_var,
+        'R': _dsl_random,
+        'O': _dsl_or,
+        'M': _dsl_multi,
+        'W': _dsl_weighted,
+        'C': _dsl_category,
+    }
+
     def _resolve_dsl(self, text: str) -> str:
         """
         Resolve custom DSL expressions in text.
@@ -75,233 +423,110 @@ class TechnobabbleGenerator:
         Returns:
             Text with DSL expressions resolved
         """
-        
-        def find_matching_brace(text, start_pos):
-            """Find the matching closing brace for an opening brace at start_pos."""
-            if text[start_pos] != '{':
-                return -1
-            
-            depth = 0
-            for i in range(start_pos, len(text)):
-                if text[i] == '{':
-                    depth += 1
-                elif text[i] == '}':
-                    depth -= 1
-                    if depth == 0:
-                        return i
-            return -1
-        
-        def resolve_expression(expr):
-            """Resolve a single DSL expression."""
-            expr = expr.strip()
-            
-            # Variable storage: {VAR:name value} or {VAR:name}
-            if expr.startswith('VAR:'):
-                parts = expr[4:].strip().split(None, 1)
-                var_name = parts[0]
-                if len(parts) > 1:
-                    # Store value and resolve it: {VAR:cve CVE-2021-{R 1000-9999}}
-                    value = parts[1]
-                    # Check if this variable is already stored (to avoid re-resolving)
-                    if var_name not in self.variables:
-                        # Resolve any nested expressions in the value
-                        resolved_value = self._resolve_dsl(value)
-                        self.variables[var_name] = resolved_value
-                        return resolved_value
-                    else:
-                        # Variable already exists, return its stored value
-                        return self.variables[var_name]
-                else:
-                    # Retrieve value: {VAR:cve}
-                    if var_name in self.variables:
-                        return self.variables[var_name]
-                    return '{' + expr + '}'
-            
-            # Random range: {R 100-999} or {R 100-999 SEED:mult}
-            if expr.startswith('R '):
-                range_part = expr[2:].strip()
-                try:
-                    # Check if there's a seed multiplier
-                    seed_mult = None
-                    if 'SEED:' in range_part:
-                        parts = range_part.split('SEED:')
-                        range_part = parts[0].strip()
-                        seed_mult = parts[1].strip()
-                    
-                    start, end = map(int, range_part.split('-'))
-                    
-                    # If seed multiplier is provided, use it to create a sub-generator
-                    if seed_mult and self.seed is not None:
-                        # Create a unique seed based on base seed and multiplier
-                        # Always use hash for consistency regardless of multiplier type
-                        mult_value = int(seed_mult) if seed_mult.isdigit() else seed_mult
-                        sub_seed = hash((self.seed, mult_value))
-                        # Store or retrieve the value for this seed multiplier
-                        if seed_mult not in self.seed_multipliers:
-                            temp_state = random.getstate()
-                            random.seed(sub_seed)
-                            self.seed_multipliers[seed_mult] = str(random.randint(start, end))
-                            random.setstate(temp_state)
-                        return self.seed_multipliers[seed_mult]
-                    else:
-                        return str(random.randint(start, end))
-                except (ValueError, IndexError):
-                    return '{' + expr + '}'  # Return original if invalid
-            
-            # OR choice: {O opt1|opt2|opt3}
-            elif expr.startswith('O '):
-                options_part = expr[2:].strip()
-                options = [opt.strip() for opt in options_part.split('|')]
-                return random.choice(options)
-            
-            # Multi-pick: {M2 item1|item2|item3} or {MN item1|item2|item3}
-            elif expr.startswith('M') and ' ' in expr:
-                parts = expr.split(' ', 1)
-                try:
-                    count = int(parts[0][1:])  # Extract number from M2, M3, etc.
-                    items_part = parts[1].strip()
-                    items = [item.strip() for item in items_part.split('|')]
-                    # Pick 'count' unique items
-                    if count > len(items):
-                        count = len(items)
-                    selected = random.sample(items, count)
-                    return ' '.join(selected)
-                except (ValueError, IndexError):
-                    return '{' + expr + '}'
-            
-            # Weighted choice: {W item1:weight1|item2:weight2}
-            elif expr.startswith('W '):
-                options_part = expr[2:].strip()
-                try:
-                    items = []
-                    weights = []
-                    for option in options_part.split('|'):
-                        item, weight = option.strip().rsplit(':', 1)
-                        items.append(item.strip())
-                        weights.append(float(weight))
-                    return random.choices(items, weights=weights, k=1)[0]
-                except (ValueError, IndexError):
-                    return '{' + expr + '}'
-            
-            # Category call: {C CATEGORY} or {C2 CATEGORY}
-            elif expr.startswith('C'):
-                # Check if it's multi-pick from category like {C2 ACTION}
-                if len(expr) > 1 and expr[1].isdigit():
-                    try:
-                        count = int(expr[1])
-                        category = expr[2:].strip()
-                        if category in self.grammar:
-                            # Pick 'count' unique items from category
-                            options = [text for _, text in self.grammar[category]]
-                            if count > len(options):
-                                count = len(options)
-                            selected = random.sample(options, count)
-                            return ' '.join(selected)
-                    except (ValueError, IndexError):
-                        return '{' + expr + '}'
-                else:
-                    # Simple category call {C CATEGORY}
-                    category = expr[1:].strip()
-                    if category in self.grammar:
-                        return self._weighted_choice(self.grammar[category])
-            
-            return '{' + expr + '}'  # Return original if not matched
-        
-        # Process text using brace matching
-        result = []
-        i = 0
-        max_iterations = self.MAX_DSL_ITERATIONS
-        iterations = 0
-        
-        while i < len(text) and iterations < max_iterations:
-            if text[i] == '{':
-                # Find matching closing brace
-                close_pos = find_matching_brace(text, i)
-                if close_pos != -1:
-                    # Extract and resolve the expression
-                    expr = text[i+1:close_pos]
-                    resolved = resolve_expression(expr)
-                    result.append(resolved)
-                    i = close_pos + 1
-                else:
-                    # No matching brace, treat as literal
-                    result.append(text[i])
-                    i += 1
-            else:
-                result.append(text[i])
-                i += 1
-        
-        # Join and check if we need another iteration (for nested expressions)
-        new_text = ''.join(result)
-        if new_text != text and '{' in new_text:
-            iterations += 1
-            if iterations < max_iterations:
-                return self._resolve_dsl(new_text)
-        
-        return new_text
-    
-    def _expand_rule(self, text: str, depth: int = 0, max_depth: int = 50) -> str:
-        """
-        Recursively expand non-terminal symbols in text until only terminals remain.
-        
-        Args:
-            text: Text containing potential non-terminal symbols
-            depth: Current recursion depth
-            max_depth: Maximum recursion depth to prevent infinite loops
-            
-        Returns:
-            Fully expanded text with only terminal symbols
-        """
-        if depth > max_depth:
+        # Fast exit: no brace, no DSL work (containment test is memchr-cheap)
+        if '{' not in text:
             return text
-        
-        # First, resolve any DSL expressions (they might generate angle bracket symbols)
-        text = self._resolve_dsl(text)
-        
-        # Find all non-terminals in angle brackets
-        pattern = r'<([^>]+)>'
-        match = re.search(pattern, text)
-        
-        if not match:
-            # No more non-terminals, return the text
-            return text
-        
-        # Get the non-terminal symbol
-        symbol = match.group(1)
-        
+
+        # Innermost-first fixed point: every pass substitutes each brace
+        # group with no nested braces in one C-level regex scan; expressions
+        # exposed by a substitution are handled on the next pass. In the
+        # common case the replacements contain no new brace, so the pass
+        # count tells us we are done without a confirmation rescan; a pass
+        # that changes nothing (unresolved expressions stay literal) also
+        # ends the loop.
+        for _ in range(self.MAX_DSL_ITERATIONS):
+            new_text, n_subs = _DSL_RE.subn(
+                lambda m: self._resolve_expression(m.group(1)), text)
+            if n_subs == 0 or '{' not in new_text:
+                return new_text
+            if new_text == text:
+                break
+            text = new_text
+
+        return text
+    
+    def _expand_symbol(self, symbol: str) -> str:
+        """Resolve a single <symbol> non-terminal to its replacement text."""
+        symbol = sys.intern(symbol)
+
         # Check if this is a random number range (e.g., <random:1-100>)
         if symbol.startswith('random:'):
             range_part = symbol.split(':', 1)[1]
             try:
                 start, end = map(int, range_part.split('-'))
-                random_num = str(random.randint(start, end))
-                text = text[:match.start()] + random_num + text[match.end():]
-                return self._expand_rule(text, depth + 1, max_depth)
+                return str(self._randint(start, end))
             except (ValueError, IndexError):
                 # Invalid format, skip it
-                text = text[:match.start()] + text[match.end():]
-                return self._expand_rule(text, depth + 1, max_depth)
-        
+                return ''
+
         # Check if we have a rule for this symbol
         if symbol in self.grammar:
-            # Expand the symbol
-            expansion = self._weighted_choice(self.grammar[symbol])
-            
+            # Single-option categories always expand the same way; skip the
+            # weighted draw and hand back the memoized string
+            expansion = self._singletons.get(symbol)
+            if expansion is None:
+                expansion = self._pick(symbol)
+
             # Store context for certain symbols
-            if symbol in ['vendor', 'os', 'product', 'version_number']:
+            if symbol in _CONTEXT_KEYS:
                 self.context[symbol] = expansion
-            
-            # Replace the non-terminal with its expansion
-            text = text[:match.start()] + expansion + text[match.end():]
-            
-            # Continue expanding recursively
-            return self._expand_rule(text, depth + 1, max_depth)
-        else:
-            # Unknown symbol, leave it as is and continue with remaining symbols
-            # Replace with empty string or keep the brackets
-            text = text[:match.start()] + text[match.end():]
-            return self._expand_rule(text, depth + 1, max_depth)
-    
+
+            return expansion
+
+        # Unknown symbol: drop it and continue with the remaining symbols
+        return ''
+
+    def _expand_rule(self, text: str, depth: int = 0, max_depth: int = 50) -> str:
+        """
+        Expand non-terminal symbols and DSL expressions until only terminals remain.
+
+        DSL brace groups and <symbol> non-terminals are handled by one fused
+        regex substitution, so each pass over the template resolves a whole
+        expansion level in a single C-level scan instead of alternating
+        separate DSL and non-terminal passes.
+
+        Args:
+            text: Text containing potential non-terminal symbols
+            depth: Expansion level to start from
+            max_depth: Maximum expansion levels to prevent infinite loops
+
+        Returns:
+            Fully expanded text with only terminal symbols
+        """
+
+        pending = False
+
+        def replace_token(match):
+            nonlocal pending
+            expr = match.group(1)
+            if expr is not None:
+                replacement = self._resolve_expression(expr)
+            else:
+                symbol = match.group(2)
+                replacement = self._expand_symbol(symbol)
+                if symbol in self.pure_terminals:
+                    # Pure-terminal category: never needs rescanning
+                    return replacement
+            if '<' in replacement or '{' in replacement:
+                pending = True
+            return replacement
+
+        for _ in range(depth, max_depth + 1):
+            new_text = _TOKEN_RE.sub(replace_token, text)
+            if new_text == text:
+                break
+            text = new_text
+            if not pending and '{' not in new_text:
+                # Every substitution this pass was terminal text and no
+                # brace group is left over (an outer group around a nested
+                # DSL expression is invisible to the innermost-only token
+                # pattern, so pending alone can't prove we're done), so
+                # skip the verification scan that would find nothing to do
+                break
+            pending = False
+
+        return text
+
     def _apply_mutations(self, sentence: str) -> str:
         """
         Apply sentence-level mutations for variety.
@@ -312,21 +537,24 @@ class TechnobabbleGenerator:
         Returns:
             Mutated sentence
         """
-        # Randomly capitalize certain security terms
-        security_terms = ['critical', 'vulnerability', 'exploit', 'remote', 'authentication']
-        for term in security_terms:
-            if term in sentence.lower() and random.random() < 0.3:
-                sentence = re.sub(
-                    r'\b' + term + r'\b', 
-                    term.upper(), 
-                    sentence, 
-                    flags=re.IGNORECASE,
-                    count=1
-                )
-        
+        # One getrandbits call supplies every Bernoulli event for this
+        # sentence: an 8-bit slice per security term (77/256 ~ 0.3) plus one
+        # for the urgency marker (38/256 ~ 0.15)
+        bits = self._rng.getrandbits(48)
+
+        # Randomly capitalize certain security terms; one combined search
+        # skips the per-term loop for the common term-free sentence
+        if _ANY_SECURITY_RE.search(sentence):
+            for pattern, upper_term in _MUTATION_PATTERNS:
+                if bits & 0xFF < 77 and pattern.search(sentence):
+                    sentence = pattern.sub(upper_term, sentence, count=1)
+                bits >>= 8
+        else:
+            bits >>= 40
+
         # Sometimes add urgency markers
-        if random.random() < 0.15:
-            urgency = random.choice(['[URGENT] ', '[CRITICAL] ', '[ZERO-DAY] '])
+        if bits & 0xFF < 38:
+            urgency = self._choice(['[URGENT] ', '[CRITICAL] ', '[ZERO-DAY] '])
             sentence = urgency + sentence
         
         return sentence
@@ -350,17 +578,16 @@ class TechnobabbleGenerator:
         # Recursively expand until only terminals remain
         post = self._expand_rule(post)
         
-        # Apply mutations to individual sentences if enabled
+        # Apply mutations to individual sentences if enabled; mutations only
+        # touch lines that look like sentences (not headers/footers)
         if apply_mutations:
-            # Split by newlines and apply mutations to lines that look like sentences
-            lines = post.split('\n')
-            mutated_lines = []
-            for line in lines:
-                # Only apply mutations to lines that look like sentences (not headers/footers)
-                if line.strip() and not line.strip().startswith(('🧵', '📚', '🚨', '⚠️', '🔴', 'Thread', 'THREAD', 'Story', 'Daily', 'What I', 'Today\'s', 'Another day', 'Flexing', 'POV:', 'Friendly')):
-                    line = self._apply_mutations(line)
-                mutated_lines.append(line)
-            post = '\n'.join(mutated_lines)
+            mutate = self._apply_mutations
+            post = '\n'.join(
+                mutate(line)
+                if (stripped := line.strip()) and not _FORMAT_HEADER_RE.match(stripped)
+                else line
+                for line in post.split('\n')
+            )
         
         return post.strip()
     
@@ -385,13 +612,13 @@ class TechnobabbleGenerator:
         
         # Apply mutations if enabled
         if apply_mutations:
-            lines = post.split('\n')
-            mutated_lines = []
-            for line in lines:
-                if line.strip() and not line.strip().startswith(('🚨', '⚠️', '🔴', '```')):
-                    line = self._apply_mutations(line)
-                mutated_lines.append(line)
-            post = '\n'.join(mutated_lines)
+            mutate = self._apply_mutations
+            post = '\n'.join(
+                mutate(line)
+                if (stripped := line.strip()) and not _POST_HEADER_RE.match(stripped)
+                else line
+                for line in post.split('\n')
+            )
         
         return post.strip()
     
@@ -400,7 +627,8 @@ class TechnobabbleGenerator:
                  theme: Optional[str] = None,
                  apply_mutations: bool = True,
                  use_format: bool = False,
-                 use_post: bool = False) -> str:
+                 use_post: bool = False,
+                 return_sentences: bool = False):
         """
         Generate technobabble text.
         
@@ -410,9 +638,12 @@ class TechnobabbleGenerator:
             apply_mutations: Whether to apply sentence mutations
             use_format: Whether to use format templates instead of plain sentences
             use_post: Whether to use the new POST hierarchical structure
+            return_sentences: Also return the sentence list, so callers that
+                need per-sentence access don't re-split the joined text
             
         Returns:
-            Generated technobabble text
+            Generated technobabble text, or a (text, sentences) tuple when
+            return_sentences is True (plain sentence mode only)
         """
         # Reset state for each generation to avoid carryover
         self.reset_generation_state()
@@ -424,7 +655,7 @@ class TechnobabbleGenerator:
             return self.generate_format(apply_mutations)
         
         if num_sentences is None:
-            num_sentences = random.randint(4, 10)
+            num_sentences = self._rng.randint(4, 10)
         
         # Reset sentence tracking for this generation
         self.used_sentences = set()
@@ -432,44 +663,109 @@ class TechnobabbleGenerator:
         sentences = []
         max_attempts = num_sentences * self.MAX_ATTEMPTS_MULTIPLIER  # Limit attempts to avoid infinite loops
         attempts = 0
-        
+
+        # Over-generate candidates in batches and drop duplicates afterwards:
+        # in the expected case one batch covers the request, instead of
+        # re-rolling one sentence at a time when a duplicate shows up
         while len(sentences) < num_sentences and attempts < max_attempts:
-            attempts += 1
-            
-            # Clear context for each new sentence group (but keep some continuity)
-            if random.random() < 0.3:
-                self.context = {}
-            
-            # Start with the sentence rule
-            sentence = "<sentence>"
-            
-            # Recursively expand until only terminals remain
-            sentence = self._expand_rule(sentence)
-            
-            # Clean up any remaining artifacts
-            sentence = sentence.strip()
-            
-            # Ensure sentence ends with a period
-            if sentence and not sentence.endswith('.'):
-                sentence += '.'
-            
-            # Check if this sentence is unique (before mutations)
-            sentence_normalized = sentence.lower().strip()
-            if sentence_normalized not in self.used_sentences and sentence:
-                self.used_sentences.add(sentence_normalized)
-                
-                # Apply mutations if enabled
-                if apply_mutations:
-                    sentence = self._apply_mutations(sentence)
-                
-                sentences.append(sentence)
-        
-        return ' '.join(sentences)
-    
+            batch_size = int((num_sentences - len(sentences)) * 1.6) + 1
+            for _ in range(batch_size):
+                attempts += 1
+
+                # Clear context for each new sentence group (but keep some
+                # continuity); reuse the dict and skip the draw when it is
+                # already empty
+                if self.context and self._rand() < 0.3:
+                    self.context.clear()
+
+                # Expand the sentence rule until only terminals remain, then
+                # clean up any remaining artifacts
+                sentence = self._expand_rule("<sentence>").strip()
+                if not sentence:
+                    continue
+
+                # Ensure sentence ends with a period; the grammar can't
+                # guarantee this itself (expansions may end in DSL output)
+                if sentence[-1] != '.':
+                    sentence += '.'
+
+                # Check if this sentence is unique (before mutations); only the
+                # hash of the casefolded text is kept, not the string itself
+                sentence_hash = hash(sentence.casefold())
+                if sentence_hash not in self.used_sentences:
+                    self.used_sentences.add(sentence_hash)
+
+                    # Apply mutations if enabled
+                    if apply_mutations:
+                        sentence = self._apply_mutations(sentence)
+
+                    sentences.append(sentence)
+                    if len(sentences) == num_sentences:
+                        break
+
+        text = ' '.join(sentences)
+        if return_sentences:
+            return text, sentences
+        return text
+
+    def generate_many(self,
+                      count: int,
+                      num_sentences: int = None,
+                      apply_mutations: bool = True) -> List[str]:
+        """
+        Generate several posts in one call, reusing this generator's RNG.
+
+        All posts are drawn from the single instance RNG stream, so the
+        compiled grammar tables, DSL caches and seeded reproducibility are
+        shared across the whole batch instead of paying per-generator setup
+        for each post.
+
+        Args:
+            count: Number of posts to generate
+            num_sentences: Sentences per post (random 4-10 if None)
+            apply_mutations: Whether to apply sentence mutations
+
+        Returns:
+            List of generated posts, in generation order
+        """
+        generate = self.generate
+        return [
+            generate(num_sentences=num_sentences, apply_mutations=apply_mutations)
+            for _ in range(count)
+        ]
+
+    def clone(self, seed: Optional[int] = None) -> 'TechnobabbleGenerator':
+        """
+        Create a fresh generator that shares this one's parsed grammar.
+
+        Avoids re-reading and re-parsing the YAML file when several
+        generators are needed in one process.
+
+        Args:
+            seed: Random seed for the new generator (optional)
+
+        Returns:
+            New TechnobabbleGenerator with shared grammar and clean state
+        """
+        new = self.__class__.__new__(self.__class__)
+        new.grammar = self.grammar
+        new.choices = self.choices
+        new.pure_terminals = self.pure_terminals
+        new._singletons = self._singletons
+        new.context = {}
+        new.variables = {}
+        new.used_sentences = set()
+        new.seed = seed
+        new.seed_multipliers = {}
+        new._dsl_cache = self._dsl_cache
+        new._rng = random.Random(seed)
+        new._bind_rng_shortcuts()
+        return new
+
     def set_seed(self, seed: int):
         """Set random seed for reproducibility."""
         self.seed = seed
-        random.seed(seed)
+        self._rng.seed(seed)
         # Reset state-dependent attributes
         self.variables = {}
         self.seed_multipliers = {}
@@ -5,15 +5,31 @@ Tests for the Technobabble Generator
 
 import unittest
 import random
+import re
 from technobabble_generator import TechnobabbleGenerator
 
 
+# One pass over the output catches leftover non-terminals and DSL commands
+# (including stranded {VAR groups — resolved output never contains them)
+_UNRESOLVED_RE = re.compile(r'[<>]|\{(?:[CROMW]|VAR)')
+
+
 class TestTechnobabbleGenerator(unittest.TestCase):
     """Test cases for TechnobabbleGenerator class."""
     
+    @classmethod
+    def setUpClass(cls):
+        """Parse the grammar once and share it across all tests."""
+        cls._template = TechnobabbleGenerator(grammar_file="grammar_rules.yaml")
+
     def setUp(self):
         """Set up test fixtures."""
-        self.generator = TechnobabbleGenerator(grammar_file="grammar_rules.yaml")
+        self.generator = self._template.clone()
+
+    def _assert_fully_resolved(self, output):
+        """Assert no unresolved symbols or DSL remain, in a single scan."""
+        m = _UNRESOLVED_RE.search(output)
+        self.assertIsNone(m, msg=f"unresolved {m.group() if m else ''!r} in output")
     
     def test_generator_initialization(self):
         """Test that generator initializes correctly."""
@@ -22,20 +38,20 @@ class TestTechnobabbleGenerator(unittest.TestCase):
     
     def test_reproducibility_with_seed(self):
         """Test that same seed produces same output."""
-        gen1 = TechnobabbleGenerator(grammar_file="grammar_rules.yaml", seed=42)
+        gen1 = self._template.clone(seed=42)
         output1 = gen1.generate(num_sentences=5, apply_mutations=False)
         
-        gen2 = TechnobabbleGenerator(grammar_file="grammar_rules.yaml", seed=42)
+        gen2 = self._template.clone(seed=42)
         output2 = gen2.generate(num_sentences=5, apply_mutations=False)
         
         self.assertEqual(output1, output2)
     
     def test_different_seeds_produce_different_output(self):
         """Test that different seeds produce different output."""
-        gen1 = TechnobabbleGenerator(grammar_file="grammar_rules.yaml", seed=42)
+        gen1 = self._template.clone(seed=42)
         output1 = gen1.generate(num_sentences=5)
         
-        gen2 = TechnobabbleGenerator(grammar_file="grammar_rules.yaml", seed=123)
+        gen2 = self._template.clone(seed=123)
         output2 = gen2.generate(num_sentences=5)
         
         self.assertNotEqual(output1, output2)
@@ -49,15 +65,11 @@ class TestTechnobabbleGenerator(unittest.TestCase):
     def test_sentence_count(self):
         """Test that correct number of sentences are generated."""
         for num in [4, 6, 10]:
-            output = self.generator.generate(num_sentences=num)
-            # Split by '. ' to count sentences more reliably
-            # Add a final period if not present for consistent counting
-            if not output.endswith('.'):
-                output += '.'
-            # Split and filter out empty strings
-            sentences = [s.strip() for s in output.split('. ') if s.strip()]
-            # The count should be close to requested (may have extra due to splits on periods in text)
-            self.assertGreaterEqual(len(sentences), num - 1)  # Allow for edge cases
+            # Ask for the sentence list directly instead of re-splitting the
+            # joined text (periods inside sentences make splitting lossy)
+            _, sentences = self.generator.generate(num_sentences=num,
+                                                   return_sentences=True)
+            self.assertEqual(len(sentences), num)
     
     def test_random_sentence_count(self):
         """Test that random sentence count is within range."""
@@ -71,8 +83,7 @@ class TestTechnobabbleGenerator(unittest.TestCase):
         """Test that all symbols are resolved (no < > remaining)."""
         output = self.generator.generate(num_sentences=10, apply_mutations=False)
         # Should not contain unresolved non-terminals
-        self.assertNotIn('<', output)
-        self.assertNotIn('>', output)
+        self._assert_fully_resolved(output)
     
     def test_weighted_choice(self):
         """Test weighted choice functionality."""
@@ -106,6 +117,15 @@ class TestTechnobabbleGenerator(unittest.TestCase):
         
         self.assertEqual(output1, output2)
     
+    def test_set_seed_leaves_global_rng_alone(self):
+        """Test that set_seed does not touch the module-level random state."""
+        random.seed(7)
+        expected = [random.random() for _ in range(3)]
+        random.seed(7)
+        self.generator.set_seed(42)
+        observed = [random.random() for _ in range(3)]
+        self.assertEqual(expected, observed)
+
     def test_output_is_plausible(self):
         """Test that output contains expected security terms."""
         output = self.generator.generate(num_sentences=10)
@@ -124,15 +144,21 @@ class TestTechnobabbleGenerator(unittest.TestCase):
     
     def test_dsl_random_range(self):
         """Test DSL random range {R min-max}."""
-        gen = TechnobabbleGenerator(seed=42)
+        gen = self._template.clone(seed=42)
         result = gen._resolve_dsl("Value: {R 100-200}")
         # Should contain a number between 100 and 200
         self.assertNotIn('{R', result)
         self.assertIn('Value:', result)
     
+    def test_dsl_regex_precompiled(self):
+        """Test that the DSL patterns are compiled once at module scope."""
+        import technobabble_generator as tg
+        self.assertIsInstance(tg._DSL_RE, re.Pattern)
+        self.assertIsInstance(tg._TOKEN_RE, re.Pattern)
+
     def test_dsl_or_choice(self):
         """Test DSL OR choice {O opt1|opt2|opt3}."""
-        gen = TechnobabbleGenerator(seed=42)
+        gen = self._template.clone(seed=42)
         result = gen._resolve_dsl("Choose: {O apple|banana|cherry}")
         # Should contain one of the options
         self.assertNotIn('{O', result)
@@ -141,7 +167,7 @@ class TestTechnobabbleGenerator(unittest.TestCase):
     
     def test_dsl_multi_pick(self):
         """Test DSL multi-pick {M2 item1|item2|item3}."""
-        gen = TechnobabbleGenerator(seed=42)
+        gen = self._template.clone(seed=42)
         result = gen._resolve_dsl("Pick two: {M2 red|green|blue|yellow}")
         # Should contain two different items
         self.assertNotIn('{M2', result)
@@ -149,7 +175,7 @@ class TestTechnobabbleGenerator(unittest.TestCase):
     
     def test_dsl_weighted_choice(self):
         """Test DSL weighted choice {W item1:weight1|item2:weight2}."""
-        gen = TechnobabbleGenerator(seed=42)
+        gen = self._template.clone(seed=42)
         result = gen._resolve_dsl("Weighted: {W common:10|rare:1}")
         # Should contain one of the options
         self.assertNotIn('{W', result)
@@ -157,7 +183,7 @@ class TestTechnobabbleGenerator(unittest.TestCase):
     
     def test_dsl_category_call(self):
         """Test DSL category call {C CATEGORY}."""
-        gen = TechnobabbleGenerator(seed=42)
+        gen = self._template.clone(seed=42)
         # severity is a simple category in the grammar
         result = gen._resolve_dsl("Severity: {C severity}")
         # Should have resolved to something from severity category
@@ -166,7 +192,7 @@ class TestTechnobabbleGenerator(unittest.TestCase):
     
     def test_variable_storage_and_retrieval(self):
         """Test DSL variable storage and retrieval."""
-        gen = TechnobabbleGenerator(seed=42)
+        gen = self._template.clone(seed=42)
         # Store and retrieve a simple value
         result = gen._resolve_dsl("ID: {VAR:id 12345}. Same ID: {VAR:id}")
         self.assertNotIn('{VAR', result)
@@ -174,7 +200,7 @@ class TestTechnobabbleGenerator(unittest.TestCase):
     
     def test_variable_with_nested_expression(self):
         """Test variable storage with nested random expressions."""
-        gen = TechnobabbleGenerator(seed=42)
+        gen = self._template.clone(seed=42)
         # Store a value that contains a random expression
         result = gen._resolve_dsl("CVE: {VAR:cve CVE-2021-{R 1000-9999}}. Reference: {VAR:cve}")
         self.assertNotIn('{VAR', result)
@@ -186,9 +212,21 @@ class TestTechnobabbleGenerator(unittest.TestCase):
         self.assertEqual(cve1, cve2)
         self.assertTrue(cve1.startswith('CVE-2021-'))
     
+    def test_expand_rule_resolves_nested_dsl(self):
+        """Test that _expand_rule fully resolves nested DSL expressions."""
+        gen = self._template.clone(seed=42)
+        # Nested store with no later retrieval: the outer {VAR:...} group
+        # only becomes matchable after its inner {R} resolves
+        result = gen._expand_rule("ID is {VAR:x ABC-{R 100-999}} end.")
+        self._assert_fully_resolved(result)
+        self.assertNotIn('{', result)
+        # Outer option group wrapping nested ranges (the 'insider' rule shape)
+        result = gen._expand_rule("patched in {O Q{R 1-4} {R 2026-2027}|never}.")
+        self.assertNotIn('{', result)
+
     def test_seed_multiplier(self):
         """Test seed multipliers for consistent random values."""
-        gen = TechnobabbleGenerator(seed=42)
+        gen = self._template.clone(seed=42)
         # Same seed multiplier should give same value
         result = gen._resolve_dsl("Count: {R 100-200 SEED:systems}. Again: {R 100-200 SEED:systems}.")
         self.assertNotIn('{R', result)
@@ -197,7 +235,6 @@ class TestTechnobabbleGenerator(unittest.TestCase):
         parts = result.split('.')
         count_part = parts[0]  # "Count: X"
         again_part = parts[1]  # " Again: Y"
-        import re
         count_num = re.search(r'Count:\s*(\d+)', count_part)
         again_num = re.search(r'Again:\s*(\d+)', again_part)
         self.assertIsNotNone(count_num)
@@ -206,18 +243,16 @@ class TestTechnobabbleGenerator(unittest.TestCase):
     
     def test_no_duplicate_sentences(self):
         """Test that sentences are not duplicated within a single generation."""
-        gen = TechnobabbleGenerator(seed=42)
-        output = gen.generate(num_sentences=10, apply_mutations=False)
-        # Split on '. ' and normalize - using fewer sentences reduces edge case risk
-        sentences = [s.strip().lower() for s in output.split('. ') if s.strip()]
-        # All sentences should be unique
-        unique_sentences = set(sentences)
-        # Allow for minor variation due to splitting edge cases
-        self.assertGreaterEqual(len(unique_sentences), len(sentences) - 1)
+        gen = self._template.clone(seed=42)
+        _, sentences = gen.generate(num_sentences=10, apply_mutations=False,
+                                    return_sentences=True)
+        # All sentences should be unique (case-insensitively)
+        unique_sentences = {s.lower() for s in sentences}
+        self.assertEqual(len(unique_sentences), len(sentences))
     
     def test_reset_generation_state(self):
         """Test that generation state is reset between generations."""
-        gen = TechnobabbleGenerator(seed=42)
+        gen = self._template.clone(seed=42)
         # Generate once and store some variables
         gen.variables['test'] = 'value1'
         gen.seed_multipliers['mult1'] = '100'
@@ -232,41 +267,24 @@ class TestTechnobabbleGenerator(unittest.TestCase):
     
     def test_new_categories_exist(self):
         """Test that new hierarchical categories are loaded."""
-        self.assertIn('POST', self.generator.grammar)
-        self.assertIn('TYPE', self.generator.grammar)
-        self.assertIn('TUTORIAL_POST', self.generator.grammar)
-        self.assertIn('TIP_POST', self.generator.grammar)
-        self.assertIn('DISCOVERY_POST', self.generator.grammar)
-        self.assertIn('WARNING_POST', self.generator.grammar)
-        self.assertIn('RANT_POST', self.generator.grammar)
-        self.assertIn('THEORY_POST', self.generator.grammar)
-        self.assertIn('INTRO', self.generator.grammar)
-        self.assertIn('TECH_CHAIN', self.generator.grammar)
-        self.assertIn('SYSTEM', self.generator.grammar)
-        self.assertIn('OS', self.generator.grammar)
-        self.assertIn('VENDOR', self.generator.grammar)
-        self.assertIn('EXPLOIT_STYLE', self.generator.grammar)
-        self.assertIn('EVIDENCE', self.generator.grammar)
-        self.assertIn('CONSEQUENCE', self.generator.grammar)
-        self.assertIn('COMMENT', self.generator.grammar)
-        self.assertIn('OUTRO', self.generator.grammar)
+        expected = frozenset({
+            'POST', 'TYPE', 'TUTORIAL_POST', 'TIP_POST', 'DISCOVERY_POST',
+            'WARNING_POST', 'RANT_POST', 'THEORY_POST', 'INTRO', 'TECH_CHAIN',
+            'SYSTEM', 'OS', 'VENDOR', 'EXPLOIT_STYLE', 'EVIDENCE',
+            'CONSEQUENCE', 'COMMENT', 'OUTRO',
+        })
+        missing = expected - self.generator.grammar.keys()
+        self.assertFalse(missing, f"missing categories: {sorted(missing)}")
     
     def test_post_generation(self):
         """Test that POST category generates valid output."""
-        gen = TechnobabbleGenerator(seed=42)
+        gen = self._template.clone(seed=42)
         post = gen._expand_rule('<POST>')
         # Should be a string with some content
         self.assertIsInstance(post, str)
         self.assertGreater(len(post), 10)
-        # Should not have unresolved symbols
-        self.assertNotIn('<', post)
-        self.assertNotIn('>', post)
-        # Should not have unresolved DSL
-        self.assertNotIn('{C', post)
-        self.assertNotIn('{R', post)
-        self.assertNotIn('{O', post)
-        self.assertNotIn('{M', post)
-        self.assertNotIn('{W', post)
+        # Should not have unresolved symbols or DSL
+        self._assert_fully_resolved(post)
 
 
 if __name__ == '__main__':